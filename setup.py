@@ -3,10 +3,16 @@ import setuptools
 def get_readme_descriptions(fp='README.md', s='#', stop_at=2):
     with open(fp, 'r') as infile:
         # Extract description (title) and long description including n sections
-        readme = [l.strip() for l in infile.read().split('\n')]
+        readme = [l.strip() for l in infile.read().splitlines()]
         description = readme[0].replace('# ', '')
-        heading_idx = [idx for idx, l in enumerate(readme) if l.startswith(s)]
-        long_description = '  \n'.join(readme[:heading_idx[stop_at]])
+        count, stop = 0, len(readme)
+        for idx, l in enumerate(readme):
+            if l.startswith(s):
+                if count == stop_at:
+                    stop = idx
+                    break
+                count += 1
+        long_description = '  \n'.join(readme[:stop])
     return description, long_description
     
 description, long_description = get_readme_descriptions()
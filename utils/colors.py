@@ -1,6 +1,7 @@
 # ------------------------------------------------------------------------------
 # Colors 
 
+import numpy as np
 import seaborn as sns
 import matplotlib as mpl
 
@@ -11,15 +12,15 @@ hex_dict.update(mpl.colors.cnames)
 
 def hex_to_RGB(hex):
     ''' "#FFFFFF" -> [255,255,255] '''
-    # Pass 16 to the integer function for change of base
-    return [int(hex[i:i+2], 16) for i in range(1,6,2)]
+    # One base-16 parse, components extracted with bit shifts
+    v = int(hex[1:7], 16)
+    return [(v >> 16) & 0xFF, (v >> 8) & 0xFF, v & 0xFF]
 
 def RGB_to_hex(RGB):
     ''' [255,255,255] -> "#FFFFFF" '''
     # Components need to be integers for hex to make sense
-    RGB = [int(x) for x in RGB]
-    return "#"+"".join(["0{0:x}".format(v) if v < 16 else
-            "{0:x}".format(v) for v in RGB])
+    r, g, b = (int(x) for x in RGB)
+    return f"#{r:02x}{g:02x}{b:02x}"
 
 def color_dict(gradient):
     ''' Takes in a list of RGB sub-lists and returns dictionary of
@@ -48,19 +49,14 @@ def linear_gradient(start_hex, finish_hex="#FFFFFF", n=10, hex_dict=hex_dict):
         finish_hex = hex_dict[finish_hex]
 
     # Starting and ending colors in RGB form
-    s = hex_to_RGB(start_hex)
-    f = hex_to_RGB(finish_hex)
-    
-    # Initilize a list of the output colors with the starting color
-    RGB_list = [s]
-    
-    # Calcuate a color at each evenly spaced value of t from 1 to n
-    for t in range(1, n):
-    
-        # Interpolate RGB vector for color at the current value of t
-        curr_vector = [int(s[j] + (float(t)/(n-1))*(f[j]-s[j])) for j in range(3)]
-        
-        # Add it to our list of output colors
-        RGB_list.append(curr_vector)
+    s = np.array(hex_to_RGB(start_hex), dtype=np.float64)
+    f = np.array(hex_to_RGB(finish_hex), dtype=np.float64)
+
+    # Interpolate all colors at once over evenly spaced values of t
+    if n > 1:
+        t = np.arange(n)[:, None] / (n - 1)
+        RGB_list = (s + t * (f - s)).astype(int).tolist()
+    else:
+        RGB_list = [s.astype(int).tolist()]
 
     return color_dict(RGB_list)
\ No newline at end of file
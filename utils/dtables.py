@@ -6,11 +6,22 @@ from . import utils
 import os
 import numpy as np
 import pandas as pd
-from functools import reduce
+from collections import Counter
 
 def neat_n(n): return f'{n:,.0f}'
 def neat_p(p): return f'{round(p*100, 1)}%' if pd.notnull(p) else '-'
 
+def neat_n_col(col):
+    """Format a numeric column as comma-separated counts in one pass"""
+    return pd.Series([f'{v:,.0f}' for v in col.to_numpy()], index=col.index)
+
+def neat_p_col(col):
+    """Format a proportion column as percentages in one pass, nulls as '-'"""
+    vals = np.round(col.to_numpy(dtype=float) * 100, 1)
+    mask = np.isnan(vals)
+    return pd.Series([('-' if m else f'{v}%') for v, m in zip(vals, mask)],
+                     index=col.index)
+
 def dfshape(df):
     """A cleaner version of df.shape
 
@@ -48,8 +59,8 @@ def dft(col, neat=True, dropna=True, sort_index=False, binned=False):
     })
     tab = tab.sort_index() if sort_index else tab
     if neat:
-        tab['n'] = tab['n'].apply(neat_n)
-        tab['p'] = tab['p'].apply(neat_p)
+        tab['n'] = neat_n_col(tab['n'])
+        tab['p'] = neat_p_col(tab['p'])
     return tab
 
 
@@ -80,7 +91,7 @@ def describe_multi(df, cols):
     return df[cols].apply(describe).T.convert_dtypes()
 
 def dnum(df_col, rnd=3):
-    if df_col.dtype in [int, float]:
+    if pd.api.types.is_numeric_dtype(df_col):
         return df_col.describe().round(rnd).to_frame().T
     else:
         return np.nan
@@ -96,11 +107,12 @@ def presentation_table(df):
     """
     for c in df:
         if c == 'n' or c.startswith('n_'):
-            df[c] = df[c].apply(neat_n)
+            df[c] = neat_n_col(df[c])
         if c == 'p' or c.startswith('p_'):
-            df[c] = df[c].apply(neat_p)
+            df[c] = neat_p_col(df[c])
         if c.startswith('mean_'):
-            df[c] = df[c].apply(lambda n: f'{n:.3f}')
+            df[c] = pd.Series([f'{v:.3f}' for v in df[c].to_numpy()],
+                              index=df.index)
     return df
 
 def get_column_unique(fp, col):
@@ -119,15 +131,24 @@ def get_column_unique(fp, col):
 
 def join_dfs(df_list):
     """Joins a list of pd.DataFrame objects"""
-    return reduce(lambda df_n,df_i: df_n.join(df_i), df_list)
+    if all(df.index.equals(df_list[0].index) for df in df_list[1:]):
+        # Shared index: single N-way concat instead of N growing joins
+        return pd.concat(df_list, axis=1)
+    return df_list[0].join(df_list[1:])
 
 
-def binned_col(col, 
+def binned_col(col,
                bins=[-0.1, 0, 1, 10, 100, 1000, 10000],
                labels=['0', '1', '2-10','11-100','101-1000','1000+']):
     """Get log-style binning of column by default"""
-    n_bins = pd.cut(col, bins=bins, include_lowest=True)
-    return n_bins
+    a = col.to_numpy(dtype=float)
+    bins = np.asarray(bins, dtype=float)
+
+    # Single vectorized binary search instead of pd.cut interval objects
+    codes = np.digitize(a, bins[1:], right=True)
+    codes[np.isnan(a) | (a < bins[0]) | (a > bins[-1])] = -1 # Null code
+    return pd.Series(pd.Categorical.from_codes(codes, categories=labels),
+                     index=col.index, name=col.name)
 
 
 def pivot_unique(df, index, columns, values, margins=True):
@@ -154,31 +175,39 @@ def get_cumsum_tab(col):
     Returns:
         pd.DataFrame: dataframe containing cumulative sum of values and index
     """
-    col = col.sort_values(ascending=False)
-    df = col.cumsum().reset_index()
-    df['n'] = range(1, col.shape[0]+1)
-    df.drop('index', axis=1, inplace=True)
-    df.columns = ['n_cumsum', 'n']
-    df['p'] = df['n'] / col.shape[0]
-    df['p_cumsum'] = df['n_cumsum'] / col.sum()
-    
-    return df
+    vals = np.sort(col.to_numpy())[::-1]
+    n = vals.shape[0]
+    cs = np.cumsum(vals)
+    idx = np.arange(1, n + 1)
+    return pd.DataFrame({
+        'n_cumsum': cs,
+        'n': idx,
+        'p': idx / n,
+        'p_cumsum': cs / vals.sum()
+    })
 
-def groupby_value_counts(gb, col, prefix="n_", dropna=True, reset_index=True):
+def groupby_value_counts(gb, col, prefix="n_", dropna=True, reset_index=True,
+                         dtype='int32'):
     """Get value counts for a column with a grouped DataFrame, e.g. by `serp_id`
-    
+
     Args:
         gb (pd.DataFrameGroupBy): The grouped DataFrame
         col (str): The column to get value counts for
         prefix (str, optional): The prefix to add to the column names. Defaults to "n_".
         dropna (bool): Whether to drop nulls or not
         reset_index (bool): Whether to reset the index or not
-    
+        dtype (str, optional): Output dtype for the counts; int64 wastes
+            bandwidth for typical counts. Defaults to "int32".
+
     Returns:
-        pd.DataFrame : DataFrame with value counts as `f'n_{factor}'` columns, 
+        pd.DataFrame : DataFrame with value counts as `f'n_{factor}'` columns,
         where `factor` is each unique value in the selected column.
     """
-    counts = gb[col].value_counts(dropna=dropna).unstack().fillna(0).astype(int)
+    counts = gb[col].value_counts(dropna=dropna).unstack(fill_value=0)
+    if dtype == 'int32' and counts.size and counts.to_numpy().max() >= 2**31:
+        dtype = None # Counts too large to downcast safely
+    if dtype:
+        counts = counts.astype(dtype, copy=False)
     counts.columns = [f"{prefix}_{c}" if prefix else c for c in counts]
     return counts.reset_index() if reset_index else counts
 
@@ -197,28 +226,93 @@ def get_masked_nunique(df, mask, unique):
 
 
 def df_types(df, thresh=0, perc=True):
-    # Get dtype of every cell in a column, not a fast operation
-    types = df.apply(lambda col: col.apply(lambda r: type(r)).value_counts(perc))
-    types = types.T.fillna(0)
-    types.columns = [str(c).split("'")[1] for c in types.columns]
-
-    # Get main columns type; type that composes > 50% of types
-    main_types = types.apply(lambda col: col.apply(lambda r: r > 0.5), axis=1)
+    # Classify column types from dtypes, only scanning cells when mixed
+    rows = {}
+    for name, col in df.items():
+        if col.dtype != object:
+            # Dtype already answers the question, no cell inspection needed
+            rows[name] = {str(col.dtype): 1.0 if perc else len(col)}
+            continue
+
+        inferred = pd.api.types.infer_dtype(col, skipna=True)
+        if not inferred.startswith('mixed'):
+            rows[name] = {inferred: 1.0 if perc else len(col)}
+            continue
+
+        # Mixed object column, fall back to counting cell types directly
+        counts = Counter(type(v).__name__ for v in col.to_numpy())
+        total = sum(counts.values())
+        rows[name] = {t: (n / total if perc else n)
+                      for t, n in counts.items()}
+
+    types = pd.DataFrame.from_dict(rows, orient='index').fillna(0)
+
+    # Get main column type; type that composes most of the cells
+    main_type = types.idxmax(axis=1)
 
     # Get number of types per column
-    types_binary = types.apply(lambda col: col.apply(lambda r: r > 0), axis=1)
-    types['n_types'] = types_binary.sum(axis=1)
-    
-    types['type'] = main_types.apply(lambda col: col[col].index.iloc[0], axis=1)
+    types['n_types'] = (types > 0).sum(axis=1)
+    types['type'] = main_type
 
     return types
 
+def _col_summary(col):
+    """Get null and unique counts for a column in a single pass"""
+    arr = col.to_numpy()
+    null_mask = pd.isna(arr)
+    n_null = int(null_mask.sum())
+    n_unique = len(pd.unique(arr[~null_mask]))
+    return n_null, n_unique
+
+def _multi_value_counts(arr2d):
+    """Count values across all columns of a non-negative int array at once
+
+    Offsets each column into its own histogram range so a single bincount
+    over the raveled array counts every column, avoiding a separate
+    pandas dispatch per column.
+
+    Args:
+        arr2d (np.ndarray): 2-d array of non-negative integers
+
+    Returns:
+        np.ndarray: (n_cols, max_value+1) array of value counts
+    """
+    arr = np.asarray(arr2d)
+    k = int(arr.max()) + 1
+    offsets = np.arange(arr.shape[1], dtype=np.int64) * k
+    flat = arr.astype(np.int64, copy=False) + offsets
+    counts = np.bincount(flat.ravel(), minlength=k * arr.shape[1])
+    return counts.reshape(arr.shape[1], k)
+
 def df_columns(df, type_details=True, head=3):
-    # Get useful information about DataFrame columns
+    # Get useful information about DataFrame columns, one pass per column
+    n_nulls, n_uniques = {}, {}
+
+    # Fused histogram path for blocks of small non-negative int columns;
+    # numpy dtypes only, since nullable Int64 et al. can hold pd.NA and
+    # come back as object arrays from to_numpy
+    int_cols = [c for c in df.columns
+                if isinstance(df[c].dtype, np.dtype)
+                and df[c].dtype.kind in 'iu']
+    if len(int_cols) > 1:
+        arr = df[int_cols].to_numpy()
+        if arr.size and arr.min() >= 0 \
+           and (int(arr.max()) + 1) * len(int_cols) < 2**22:
+            counts = _multi_value_counts(arr)
+            for i, c in enumerate(int_cols):
+                n_nulls[c] = 0 # numpy int columns cannot hold nulls
+                n_uniques[c] = int(np.count_nonzero(counts[i]))
+
+    for name, col in df.items():
+        if name not in n_nulls:
+            n_nulls[name], n_uniques[name] = _col_summary(col)
+
     columns_df = pd.DataFrame({
         'dtype': df.dtypes,
-        'n_unique': df.apply(lambda col: col.nunique(), axis=0),
-        'n_null': df.apply(lambda col: col.isnull().sum(), axis=0)
+        'n_unique': pd.Series([n_uniques[c] for c in df.columns],
+                              index=df.columns),
+        'n_null': pd.Series([n_nulls[c] for c in df.columns],
+                            index=df.columns)
     })
     if type_details:
         columns_df = pd.concat([columns_df, df_types(df)], sort=True, axis=1)
@@ -233,21 +327,41 @@ def humanbytes(size):
     """Return the given bytes as a human friendly KB, MB, GB, or TB string
     KB = 2**10 = 1024
     """
-    power = 2**10
-    n = 0
     power_name = {0 : '', 1: 'KB', 2: 'MB', 3: 'GB', 4: 'TB'}
-    while size > power:
-        size /=  power
-        n += 1
-    return f'{round(size,2)} {power_name[n]}'
+    n = min(4, max(0, (int(size).bit_length() - 1) // 10))
+    return f'{round(size / (1 << (10 * n)), 2)} {power_name[n]}'
 
 
+def _memory_usage(df, sample=False, sample_n=10_000):
+    """Get deep memory usage, only paying the object-column walk when needed
+
+    Shallow usage is exact for non-object columns; object columns add the
+    deep cost, estimated from a sample when `sample` is set and the
+    column is longer than `sample_n` rows.
+    """
+    shallow = df.memory_usage(deep=False)
+    total = int(shallow.sum())
+    for c in df.columns:
+        s = df[c]
+        if s.dtype != object:
+            continue
+        if sample and len(s) > sample_n:
+            subset = s.sample(sample_n, random_state=0)
+            deep = int(subset.memory_usage(deep=True, index=False)
+                       * (len(s) / len(subset)))
+        else:
+            deep = int(s.memory_usage(deep=True, index=False))
+        total += deep - int(shallow[c])
+    return total
+
 def df_info(df, verbose=True, type_details=True, head=1, memory_usage='deep'):
     # Get a useful header of information about a DataFrame
+    first, last = (df.index[0], df.index[-1]) if len(df.index) else ('-', '-')
     info = {
         'columns': f'{df.shape[1]:,}',
-        'rows': f'{df.shape[0]:,}, {df.index._start} to {df.index._stop}',
-        'memory_usage': humanbytes(df.memory_usage(deep=True).sum()),
+        'rows': f'{df.shape[0]:,}, {first} to {last}',
+        'memory_usage': humanbytes(
+            _memory_usage(df, sample=(memory_usage == 'sample'))),
     }
     columns_df = df_columns(df, type_details=type_details, head=head)
     if verbose:
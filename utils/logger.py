@@ -6,11 +6,30 @@ import logging.config
 # Formatters: change how things gets logged
 minimal = '%(message)s'
 detailed  = '%(asctime)s | %(process)d | %(levelname)s | %(name)s | %(message)s'
-formatters = { 
+formatters = {
     'minimal': {'format': minimal},
     'detailed': {'format': detailed}
 }
 
+# Constant lookups shared by every Logger instance
+_FORMATTER_NAMES = frozenset(formatters)
+
+# Logging levels, in order of increasing detail
+_LEVEL_TYPES = ('DEBUG', 'INFO', 'WARNING')
+
+# External loggers: change logging options for other packages, built once
+_EXTERNAL_LOGGERS = {
+    'urllib3': {'level': 'WARNING'},
+    'requests': {'level': 'WARNING'},
+    'matplotlib': {'level': 'WARNING'},
+    'googleapiclient.discovery': {'level': 'ERROR'},
+    'googleapiclient.discovery_cache': {'level': 'ERROR'},
+    'asyncio': {'level': 'INFO'},
+    'chardet.charsetprober': {'level': 'INFO'},
+    'filelock': {'level':'INFO'},
+    'parso': {'level': 'INFO'} # Fix for ipython autocomplete bug
+}
+
 class Logger(object):
     """Get logger and set console and file outputs
     """
@@ -19,16 +38,16 @@ class Logger(object):
         file_name='', file_format='minimal', file_mode='w', file_level='INFO',
         console=True, console_format='detailed', console_level='DEBUG'):
     
-        # Logging levels, in order of increasing detail
-        level_types = ['DEBUG', 'INFO', 'WARNING']
-        assert file_level in level_types, f'file_level must be in {level_types}'
-        assert console_level in level_types, f'console_level must be in {level_types}'
+        assert file_level in _LEVEL_TYPES, \
+            f'file_level must be in {list(_LEVEL_TYPES)}'
+        assert console_level in _LEVEL_TYPES, \
+            f'console_level must be in {list(_LEVEL_TYPES)}'
 
         # Handlers: change file and console logging details
         handlers = {}
         if console:
-            assert console_format in formatters.keys(), \
-                f'Must select formatting type from {list(formatters.keys())}'
+            assert console_format in _FORMATTER_NAMES, \
+                f'Must select formatting type from {list(formatters)}'
 
             handlers['console_handle'] = { 
                 'class': 'logging.StreamHandler',
@@ -38,8 +57,8 @@ class Logger(object):
 
         if file_name:
             assert type(file_name) is str, 'Must provide name for file logging'
-            assert file_format in formatters.keys(), \
-                f'Must select formatting type from {list(formatters.keys())}'
+            assert file_format in _FORMATTER_NAMES, \
+                f'Must select formatting type from {list(formatters)}'
 
             handlers['file_handle'] = { 
                 'class': 'logging.FileHandler',
@@ -49,24 +68,15 @@ class Logger(object):
                 'mode': file_mode
             }
         
-        # Loggers: change logging options for root and other packages
+        # Loggers: root logger per instance, external loggers shared
         loggers = {
             # Root logger
-            '': { 
+            '': {
                 'handlers': list(handlers.keys()),
                 'level': 'DEBUG',
                 'propagate': True
             },
-            # External loggers
-            'urllib3': {'level': 'WARNING'},
-            'requests': {'level': 'WARNING'},
-            'matplotlib': {'level': 'WARNING'},
-            'googleapiclient.discovery': {'level': 'ERROR'},
-            'googleapiclient.discovery_cache': {'level': 'ERROR'},
-            'asyncio': {'level': 'INFO'},
-            'chardet.charsetprober': {'level': 'INFO'},
-            'filelock': {'level':'INFO'},
-            'parso': {'level': 'INFO'} # Fix for ipython autocomplete bug
+            **_EXTERNAL_LOGGERS
         }
 
         self.log_config = { 
@@ -77,6 +87,14 @@ class Logger(object):
             'loggers': loggers
         }
 
+    # The most recently applied config; reapplying an identical config
+    # walks every logger in the tree clearing caches, so skip only
+    # back-to-back repeats -- switching configs must always reapply
+    _last_config = None
+
     def start(self, name=__name__):
-        logging.config.dictConfig(self.log_config)
+        key = repr(self.log_config)
+        if key != Logger._last_config:
+            logging.config.dictConfig(self.log_config)
+            Logger._last_config = key
         return logging.getLogger(name)
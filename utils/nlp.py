@@ -5,62 +5,147 @@ import re
 import numpy as np
 import pandas as pd
 from jellyfish import damerau_levenshtein_distance as dl_distance
+from functools import lru_cache
 from itertools import combinations
-from nltk import word_tokenize 
-from nltk.util import ngrams
+from nltk import word_tokenize
+
+try: # Optional threaded C implementation for all-pairs distances
+    from rapidfuzz.distance import DamerauLevenshtein
+    from rapidfuzz.process import cdist
+except ImportError:
+    cdist = None
+
+from .utils import num_words
+
+# Precompiled patterns; re's internal cache is small and keyed by string
+_TOKEN_RE = re.compile(r'\w+')
+# https://zapier.com/blog/extract-links-email-phone-regex/
+_EMAIL_RE = re.compile("""(?:[a-z0-9!#$%&'*+/=?^_`{|}~-]+(?:\.[a-z0-9!#$%&'*+/=?^_`{|}~-]+)*|"(?:[\x01-\x08\x0b\x0c\x0e-\x1f\x21\x23-\x5b\x5d-\x7f]|\\[\x01-\x09\x0b\x0c\x0e-\x7f])*")@(?:(?:[a-z0-9](?:[a-z0-9-]*[a-z0-9])?\.)+[a-z0-9](?:[a-z0-9-]*[a-z0-9])?|\[(?:(?:25[0-5]|2[0-4][0-9]|[01]?[0-9][0-9]?)\.){3}(?:25[0-5]|2[0-4][0-9]|[01]?[0-9][0-9]?|[a-z0-9-]*[a-z0-9]:(?:[\x01-\x08\x0b\x0c\x0e-\x1f\x21-\x5a\x53-\x7f]|\\[\x01-\x09\x0b\x0c\x0e-\x7f])+)\])""")
+_PHONE_RE = re.compile("""(?:(?:\+?([1-9]|[0-9][0-9]|[0-9][0-9][0-9])\s*(?:[.-]\s*)?)?(?:\(\s*([2-9]1[02-9]|[2-9][02-8]1|[2-9][02-8][02-9])\s*\)|([0-9][1-9]|[0-9]1[02-9]|[2-9][02-8]1|[2-9][02-8][02-9]))\s*(?:[.-]\s*)?)?([2-9]1[02-9]|[2-9][02-9]1|[2-9][02-9]{2})\s*(?:[.-]\s*)?([0-9]{4})(?:\s*(?:#|x\.?|ext\.?|extension)\s*(\d+))?""")
 
 def get_words(string):
     # Number of words in a string
     string = str(string) if type(string) != str else string
-    words = re.findall(r'\w+', string)
+    words = _TOKEN_RE.findall(string)
     return words
 
+@lru_cache(maxsize=131072)
+def _tokenize(sentence):
+    """Memoized word_tokenize; corpora repeat sentences heavily"""
+    return tuple(word_tokenize(sentence))
+
 def get_ngrams(sentence, n=2):
-    return ['_'.join(gram) for gram in ngrams(word_tokenize(sentence), n)]
+    # \w+ is enough for lexicon ngrams and skips the Punkt + treebank
+    # pipeline word_tokenize runs per call
+    toks = _TOKEN_RE.findall(sentence)
+    return ['_'.join(toks[i:i + n]) for i in range(len(toks) - n + 1)]
 
 def multi_remove(s, remove_list=[]):
     for remove in remove_list:
         s = s.replace(remove, '').strip()
     return s
 
-def num_words(string, list_words=False):
-    # Number of words in a string
-    string = str(string) if type(string) != str else string
-    words = re.findall(r'\w+', string)
-    nwords = len(words)
-    data1 = (nwords, words) if list_words else nwords
-    return data1
-
-def score_token(token, lex): 
-    return lex[token] if token in lex else np.nan
+def score_token(token, lex):
+    return lex.get(token, np.nan)
 
 def score_tokens(tokens, lex):
-    return {t:score_token(t, lex=lex) for t in tokens if t in lex}
+    return {t:lex[t] for t in tokens if t in lex}
 
 def score_sentence(sent, lex, return_mean=True):
-    
-    # Get all bigrams in lexicon
-    bigrams = get_ngrams(sent, n=2)
-    score_dict = score_tokens(bigrams, lex=lex)
-
-    # Remove scored bigrams
-    bigrams_to_remove = [bigram.replace('_', ' ') for bigram in score_dict]
-    new_sent = multi_remove(sent, bigrams_to_remove)
-    
+
+    # Tokenize once (cached); bigrams are adjacent token pairs
+    toks = _tokenize(sent)
+    score_dict = {}
+    consumed = [False] * len(toks)
+
+    # Score bigrams in the lexicon and mark their tokens as consumed
+    for i in range(len(toks) - 1):
+        bigram = f'{toks[i]}_{toks[i+1]}'
+        if bigram in lex:
+            score_dict[bigram] = lex[bigram]
+            consumed[i] = consumed[i+1] = True
+
     # Score remaining unigrams
-    unigrams = get_ngrams(new_sent, n=1)
-    unigram_scores = score_tokens(unigrams, lex=lex)
+    for i, tok in enumerate(toks):
+        if not consumed[i] and tok in lex:
+            score_dict[tok] = lex[tok]
 
-    score_dict.update(unigram_scores)
     if return_mean:
         scores = list(score_dict.values())
         return np.mean(scores) if scores else None
     else:
         return score_dict
 
+def score_sentences_batch(sentences, lex):
+    """Score an array of sentences with flat-array lexicon lookups
+
+    Tokenizes every row with the same cached word_tokenize that
+    score_sentence uses (lexicons are keyed on treebank tokens),
+    flattens the tokens to one array with row offsets, scores bigrams
+    and remaining unigrams via vectorized lexicon reindexing, and
+    averages per row with segment reductions -- one batch of numpy ops
+    instead of a Python call per row.
+
+    Unlike score_sentence, whose score dict collapses repeated grams,
+    the row mean here weights each gram by its occurrence count, so
+    rows with repeated matched tokens can score slightly differently.
+
+    Args:
+        sentences (pd.Series/list): sentences to score
+        lex (dict): token -> score lexicon, with bigrams joined by "_"
+
+    Returns:
+        np.ndarray: mean score per sentence, NaN where nothing matched
+    """
+    if hasattr(sentences, 'to_numpy'):
+        sentences = sentences.to_numpy()
+    rows = [_tokenize(str(s)) for s in sentences]
+    lengths = np.fromiter((len(r) for r in rows), np.int64, count=len(rows))
+    out = np.full(len(rows), np.nan)
+    n = int(lengths.sum())
+    if n == 0:
+        return out
+
+    flat = np.array([t for r in rows for t in r], dtype=str)
+    lex_s = pd.Series(lex)
+    # copy=True: under copy-on-write reindex hands back read-only
+    # views, and both arrays are masked in place below
+    uni = lex_s.reindex(flat).to_numpy(dtype=float, copy=True)
+
+    if n > 1:
+        bigrams = np.char.add(np.char.add(flat[:-1], '_'), flat[1:])
+        big = lex_s.reindex(bigrams).to_numpy(dtype=float, copy=True)
+
+        # Mask pairs spanning a row boundary
+        ends = np.cumsum(lengths[lengths > 0]) - 1
+        big[ends[ends < n - 1]] = np.nan
+
+        # Bigram hits consume both their tokens, as in score_sentence
+        hit = ~np.isnan(big)
+        consumed = np.zeros(n, dtype=bool)
+        consumed[:-1] |= hit
+        consumed[1:] |= hit
+        uni[consumed] = np.nan
+        big = np.append(big, np.nan) # Align bigram starts with tokens
+    else:
+        big = np.full(n, np.nan)
+
+    # Per-row means via one reduceat over summed scores and counts
+    scores = np.nan_to_num(uni) + np.nan_to_num(big)
+    counts = (~np.isnan(uni)).astype(np.float64) + ~np.isnan(big)
+    offsets = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+    row_sum = np.add.reduceat(scores, offsets)
+    row_cnt = np.add.reduceat(counts, offsets)
+    valid = (lengths > 0) & (row_cnt > 0)
+    out[valid] = row_sum[valid] / row_cnt[valid]
+    return out
+
 def score_bigrams(sent, lex):
-    # Get all bigrams in lexicon
-    bigrams = get_ngrams(sent, n=2)
+    # Get all bigrams in lexicon, from the same cached treebank tokens
+    # the other scorers use; the regex get_ngrams would miss
+    # treebank-keyed entries (don't -> do/n't)
+    toks = _tokenize(sent)
+    bigrams = [f'{toks[i]}_{toks[i+1]}' for i in range(len(toks) - 1)]
     scores = score_tokens(bigrams, lex=lex)
     return np.mean(list(scores.values()))
 
@@ -70,17 +155,47 @@ def get_score_direction(s, thresh=0):
     elif s > thresh:      return 'right'
     elif s == thresh:     return 'center'
 
-def get_dl_variance(str_list):
+def get_dl_variance(str_list, sample=None, cutoff=None):
     """Get average Damerau-Levenshtein Distance
+
+    Args:
+        str_list (list): strings to compare pairwise
+        sample (int, optional): score this many random pairs instead of
+            all O(n^2); the distance distribution converges long before
+            every pair is seen
+        cutoff (int, optional): stop each computation once the distance
+            exceeds this value (rapidfuzz only); capped pairs count as
+            cutoff + 1
     """
-    all_pairs = [(s1, s2) for s1, s2 in combinations(str_list, 2) if str_list.any()]
+    str_list = list(str_list)
+    if len(str_list) < 2:
+        return np.nan
+
+    if sample:
+        arr = np.asarray(str_list, dtype=object)
+        i = np.random.randint(0, len(arr), sample)
+        j = np.random.randint(0, len(arr), sample)
+        keep = i != j
+        pairs = zip(arr[i[keep]], arr[j[keep]])
+        if cdist is not None:
+            return np.mean([DamerauLevenshtein.distance(a, b,
+                                                        score_cutoff=cutoff)
+                            for a, b in pairs])
+        return np.mean([dl_distance(a, b) for a, b in pairs])
+
+    if cdist is not None:
+        # All pairs in threaded C; average the upper triangle
+        dists = cdist(str_list, str_list,
+                      scorer=DamerauLevenshtein.distance, workers=-1,
+                      score_cutoff=cutoff)
+        iu = np.triu_indices(len(str_list), k=1)
+        return dists[iu].mean()
+
+    all_pairs = combinations(str_list, 2)
     return np.mean([dl_distance(s1, s2) for s1, s2 in all_pairs])
 
 def get_email_address(s):
-    # https://zapier.com/blog/extract-links-email-phone-regex/
-    regex = """(?:[a-z0-9!#$%&'*+/=?^_`{|}~-]+(?:\.[a-z0-9!#$%&'*+/=?^_`{|}~-]+)*|"(?:[\x01-\x08\x0b\x0c\x0e-\x1f\x21\x23-\x5b\x5d-\x7f]|\\[\x01-\x09\x0b\x0c\x0e-\x7f])*")@(?:(?:[a-z0-9](?:[a-z0-9-]*[a-z0-9])?\.)+[a-z0-9](?:[a-z0-9-]*[a-z0-9])?|\[(?:(?:25[0-5]|2[0-4][0-9]|[01]?[0-9][0-9]?)\.){3}(?:25[0-5]|2[0-4][0-9]|[01]?[0-9][0-9]?|[a-z0-9-]*[a-z0-9]:(?:[\x01-\x08\x0b\x0c\x0e-\x1f\x21-\x5a\x53-\x7f]|\\[\x01-\x09\x0b\x0c\x0e-\x7f])+)\])"""
-    return re.search(regex, s).group(1)
+    return _EMAIL_RE.search(s).group(1)
 
 def get_phone_number(s):
-    regex = """(?:(?:\+?([1-9]|[0-9][0-9]|[0-9][0-9][0-9])\s*(?:[.-]\s*)?)?(?:\(\s*([2-9]1[02-9]|[2-9][02-8]1|[2-9][02-8][02-9])\s*\)|([0-9][1-9]|[0-9]1[02-9]|[2-9][02-8]1|[2-9][02-8][02-9]))\s*(?:[.-]\s*)?)?([2-9]1[02-9]|[2-9][02-9]1|[2-9][02-9]{2})\s*(?:[.-]\s*)?([0-9]{4})(?:\s*(?:#|x\.?|ext\.?|extension)\s*(\d+))?"""
-    return re.search(regex, s).group(1)
\ No newline at end of file
+    return _PHONE_RE.search(s).group(1)
\ No newline at end of file
@@ -5,6 +5,12 @@ import numpy as np
 import seaborn as sns
 import matplotlib as mpl
 import matplotlib.pyplot as plt
+from scipy.stats import gaussian_kde
+
+try: # Optional C histogram backend, faster than numpy on uniform bins
+    from fast_histogram import histogram1d
+except ImportError:
+    histogram1d = None
 
 
 # ------------------------------------------------------------------------------
@@ -13,33 +19,24 @@ import matplotlib.pyplot as plt
 def set_font_config():
     """Set matplotlib fonts config for PDF publication"""
 
-    # Output fonts in pdf as text not shape
-    mpl.rcParams['pdf.fonttype'] = 42
-    mpl.rcParams['ps.fonttype'] = 42
-
     TINY_SIZE = 6
     SMALL_SIZE = 7
     LARGE_SIZE = 8
 
-    font_settings = {
-        'font': {
-            'family': 'sans-serif',
-            'weight': 'regular',
-            'size': SMALL_SIZE,
-        },
-        'axes': {
-            'titlesize': SMALL_SIZE, # fontsize of the axis title
-            'labelsize': SMALL_SIZE, # fontsize of the x and y labels
-        },
-        'xtick': {'labelsize': TINY_SIZE},   # fontsize of the tick labels
-        'ytick': {'labelsize': TINY_SIZE},   # fontsize of the tick labels
-        'legend': {'fontsize': TINY_SIZE},   # legend fontsize
-        'figure': {'titlesize': LARGE_SIZE}  # fontsize of the figure title
-    }
-
-    # Set default font size and family
-    for name, settings in font_settings.items():
-        plt.rc(name, **settings)
+    # Single rcParams merge instead of one plt.rc dispatch per group
+    mpl.rcParams.update({
+        'pdf.fonttype': 42, # Output fonts in pdf as text not shape
+        'ps.fonttype': 42,
+        'font.family': 'sans-serif',
+        'font.weight': 'regular',
+        'font.size': SMALL_SIZE,
+        'axes.titlesize': SMALL_SIZE,    # fontsize of the axis title
+        'axes.labelsize': SMALL_SIZE,    # fontsize of the x and y labels
+        'xtick.labelsize': TINY_SIZE,    # fontsize of the tick labels
+        'ytick.labelsize': TINY_SIZE,    # fontsize of the tick labels
+        'legend.fontsize': TINY_SIZE,    # legend fontsize
+        'figure.titlesize': LARGE_SIZE   # fontsize of the figure title
+    })
 
     sns.set_style("whitegrid")
 
@@ -91,32 +88,54 @@ heatmap_kws_proportion = dict(
 def get_binning(values, num_bins = 15, log_binning = True, is_pmf = True):
 
     # We need to define the support of our distribution
-    lower_bound = min(values)
-    upper_bound = max(values)
-    
-    # And the type of binning we want
+    samples = np.asarray(values, dtype=float)
     if log_binning:
-        lower_bound = np.log10(lower_bound)
-        upper_bound = np.log10(upper_bound)
-        bins = np.logspace(lower_bound,upper_bound,num_bins+1, base = 10)
+        # Bin in log2 space: the base cancels out of the index scale and
+        # log2 maps straight onto the float exponent, making it the
+        # cheapest log; bin edges are still reported in base 10
+        samples = np.log2(samples)
+        lower_bound = samples.min()
+        upper_bound = samples.max()
+        log10_2 = np.log10(2)
+        bins = np.logspace(lower_bound * log10_2, upper_bound * log10_2,
+                           num_bins + 1, base=10)
     else:
+        lower_bound = samples.min()
+        upper_bound = samples.max()
         bins = np.linspace(lower_bound,upper_bound,num_bins+1)
-    
-    # Then we can compute the histogram using numpy
+
+    # Bins are uniform (in linear or log space), so scale-and-floor
+    # indexing + bincount beats np.histogram's generic searchsorted path
+    if histogram1d is not None:
+        # Nudge the top edge so the max value lands in the last bin
+        top = np.nextafter(upper_bound, np.inf)
+        y = histogram1d(samples, bins=num_bins, range=(lower_bound, top))
+    else:
+        width = (upper_bound - lower_bound) or 1
+        idx = ((samples - lower_bound) * (num_bins / width)).astype(np.intp)
+        np.clip(idx, 0, num_bins - 1, out=idx)
+        y = np.bincount(idx, minlength=num_bins)
+
     if is_pmf:
-        y, __ = np.histogram(values, bins = bins, density=False)
         p = y/float(y.sum())
-        
-    else:
-        p, __ = np.histogram(values, bins = bins, density=True)
-    
+
+    else: # Density: counts normalized by total and per-bin width
+        p = y / (y.sum() * np.diff(bins))
+
     # Now, we need to compute for each y the value of x
-    x = bins[1:] - np.diff(bins)/2.0    
-    
-    x = x[p>0]
-    p = p[p>0]
+    return _centers_and_mask(bins, p)
+
 
-    return x, p
+def _centers_and_mask(bins, p):
+    """Get bin centers and probabilities for non-empty bins in one pass
+
+    Evaluates the mask once and computes centers only for surviving
+    bins, instead of building center/diff temporaries for all bins and
+    masking twice.
+    """
+    mask = p > 0
+    x = (bins[:-1][mask] + bins[1:][mask]) * 0.5
+    return x, p[mask]
 
 
 # ------------------------------------------------------------------------------
@@ -124,24 +143,16 @@ def get_binning(values, num_bins = 15, log_binning = True, is_pmf = True):
 
 def remove_yaxis_ticks(ax, major=True, minor=True):
     if major:
-        for tic in ax.yaxis.get_major_ticks():
-            tic.tick1line.set_visible(False)
-            tic.tick2line.set_visible(False)
+        plt.setp(ax.yaxis.get_majorticklines(), visible=False)
     if minor:
-        for tic in ax.yaxis.get_minor_ticks():
-            tic.tick1line.set_visible(False)
-            tic.tick2line.set_visible(False)
+        plt.setp(ax.yaxis.get_minorticklines(), visible=False)
 
 
 def remove_xaxis_ticks(ax, major=True, minor=True):
     if major:
-        for tic in ax.xaxis.get_major_ticks():
-            tic.tick1line.set_visible(False)
-            tic.tick2line.set_visible(False)
+        plt.setp(ax.xaxis.get_majorticklines(), visible=False)
     if minor:
-        for tic in ax.xaxis.get_minor_ticks():
-            tic.tick1line.set_visible(False)
-            tic.tick2line.set_visible(False)
+        plt.setp(ax.xaxis.get_minorticklines(), visible=False)
 
 
 def reorder_legend(handles=None, labels=None, order=None, unique=False):
@@ -160,24 +171,34 @@ def reorder_legend(handles=None, labels=None, order=None, unique=False):
         tuple: the sorted handles and labels objects
     """
 
-    # Sort both labels and handles by labels
-    labels, handles = zip(*sorted(zip(labels, handles), key=lambda l: l[0]))
     if order is not None:
-        # Sort according to a given list (not necessarily complete)
+        # Sort according to a given list (not necessarily complete);
+        # labels missing from it fall back to alphabetical order
         keys = dict(zip(order,range(len(order))))
-        labels, handles = zip(*sorted(zip(labels, handles), key=lambda l, 
-                                      keys=keys: keys.get(l[0], np.inf)))
-
-    # Keep only the first of each handle
-    if unique: 
-        labels, handles= zip(*unique_everseen(zip(labels,handles), key=labels))
+        labels, handles = zip(*sorted(zip(labels, handles),
+                                      key=lambda l: (keys.get(l[0], np.inf),
+                                                     l[0])))
+    else:
+        # Sort both labels and handles by labels
+        labels, handles = zip(*sorted(zip(labels, handles), key=lambda l: l[0]))
+
+    # Keep only the first handle seen for each label
+    if unique:
+        deduped = {}
+        for label, handle in zip(labels, handles):
+            deduped.setdefault(label, handle)
+        labels, handles = tuple(deduped), tuple(deduped.values())
     return handles, labels
 
 
 def unique_everseen(seq, key=None):
-    seen = set()
-    seen_add = seen.add
-    return [x for x,k in zip(seq,key) if not (k in seen or seen_add(k))]
+    """Keep the first occurrence of each item, optionally keyed"""
+    if key is None:
+        return list(dict.fromkeys(seq))
+    out = {}
+    for x, k in zip(seq, key):
+        out.setdefault(k, x)
+    return list(out.values())
 
 
 def set_share_axes(axs, target=None, sharex=False, sharey=False):
@@ -255,33 +276,33 @@ def quad_plot(data, xlist, ylist,
                 ax.tick_params(left=False, labelleft=False)
                 ax.set(ylabel='')
 
-    # Styling
-    for idx, ax in enumerate(axs.flatten()):
-        ax.grid(b=True, axis='x', which='major', color='#E7E8E8', linestyle='--', linewidth=0.5)
-        for spine in ['top', 'right']:
-            ax.spines[spine].set_visible(False)
-            if idx in [0, 1]:
+            # Styling, folded in so each axis is only touched once
+            ax.grid(b=True, axis='x', which='major', color='#E7E8E8',
+                    linestyle='--', linewidth=0.5)
+            for spine in ['top', 'right']:
+                ax.spines[spine].set_visible(False)
+            if xidx == 0:
                 ax.spines['bottom'].set_visible(False)
-    
+
     return fig, axs
 
 def plot_bias_distribution(dist, ax, color='#3B3838', label='',
                            linestyle='-', alpha=1, shade=True):
-    ax = sns.kdeplot(dist, color=color, shade=False, alpha=alpha,
-                     ax=ax,linestyle=linestyle, linewidth=1.2, label=label)
-    
+    # Evaluate the KDE once on a fixed grid instead of re-fetching the
+    # curve back out of the Line2D that seaborn draws
+    density = gaussian_kde(dist)
+    x = np.linspace(-1, 1, 512)
+    y = density(x)
+    ax.plot(x, y, color=color, alpha=alpha, linestyle=linestyle,
+            linewidth=1.2, label=label)
+
     if shade:
-        # Extract coordinates
-        line = ax.get_lines()[-1]
-        x, y = line.get_data()
-
-        # Shade regions by selecting those points and calling ax.fill_between:
-        mask = x >= -0.005
-        _x, _y = x[mask], y[mask]
-        ax.fill_between(_x, y1=_y, alpha=0.5, facecolor='red')
-        mask = x <= 0.01
-        _x, _y = x[mask], y[mask]
-        ax.fill_between(_x, y1=_y, alpha=0.5, facecolor='cornflowerblue')
+        # Shade each side of zero with index cuts, no boolean masks
+        right = np.searchsorted(x, -0.005)
+        ax.fill_between(x[right:], y1=y[right:], alpha=0.5, facecolor='red')
+        left = np.searchsorted(x, 0.01, side='right')
+        ax.fill_between(x[:left], y1=y[:left], alpha=0.5,
+                        facecolor='cornflowerblue')
     
     # Style
     ax.set(xlim=(-1,1))#, ylim=(0,max(y)))
@@ -8,6 +8,11 @@ import pandas as pd
 from string import ascii_letters, digits
 from jellyfish import damerau_levenshtein_distance
 
+try: # Optional bit-parallel distance that accepts integer sequences
+    from rapidfuzz.distance import DamerauLevenshtein
+except ImportError:
+    DamerauLevenshtein = None
+
 __author__ = """Ronald E. Robertson (robertson.ron@husky.neu.edu)"""
 __all__ = ['alphanumerics',
            'random_string',
@@ -16,6 +21,11 @@ __all__ = ['alphanumerics',
            'compare_ranks']
 
 
+_ALNUM = np.frombuffer((ascii_letters + digits).encode('ascii'),
+                       dtype=np.uint8)
+_RNG = np.random.default_rng()
+
+
 def alphanumerics():
     """Generate all upper and lowercase letters and digits"""
     return ascii_letters + digits
@@ -23,38 +33,55 @@ def alphanumerics():
 
 def random_string(length, replacement = False, selection = None):
     """Generate a random string of alphanumerics"""
-    selection = list(alphanumerics()) if selection is None else selection
-    return ''.join(np.random.choice(selection, length, replace=replacement))
+    if selection is None:
+        pool = _ALNUM
+    else:
+        pool = np.frombuffer(''.join(selection).encode('ascii'),
+                             dtype=np.uint8)
+    draw = _RNG.choice(pool, size=length, replace=replacement)
+    return bytes(draw).decode('ascii')
 
 
 def generate_alphanum_dict(list1):
     """Generate an alphanumeric dictionary
-    
+
     Creates an alphanumeric dictionary where they keys are the
     inputted list items and the values are selected from a random
     alphanumeric string generated with no replacement.
     """
-    chars = random_string(len(list1))   
+    assert len(list1) <= len(_ALNUM), \
+        f'Can only encode up to {len(_ALNUM)} items without replacement'
+    chars = random_string(len(list1))
     alphanum_dict = {item: chars[i] for i, item in enumerate(list1)}
     return alphanum_dict
 
 
+def _rank_as_bytes(list1, code_of, chars_arr):
+    """Map a ranked list to its character string via one numpy take"""
+    codes = np.fromiter((code_of[l] for l in list1), dtype=np.intp,
+                        count=len(list1))
+    return bytes(chars_arr[codes]).decode('ascii')
+
+
 def rank_as_string(list1, alphanum_index):
     """
-    Convert a ranked list of items into a string of characters 
-    based on a given dictionary `alph` of the format that contains 
+    Convert a ranked list of items into a string of characters
+    based on a given dictionary `alph` of the format that contains
     the ranked items and a random alphanumeric to represent it.
-    
+
     Parameters
     ----------
         list1 : list
             A list of rankings to be converted to characters
-            
+
         alph : dict
             A dictionary containing the items in list1 as keys
             and unique characters as the values.
     """
-    return ''.join([alphanum_index[l] for l in list1])
+    code_of = {item: i for i, item in enumerate(alphanum_index)}
+    chars_arr = np.frombuffer(
+        ''.join(alphanum_index.values()).encode('ascii'), dtype=np.uint8)
+    return _rank_as_bytes(list1, code_of, chars_arr)
     
 
 def jaccard_index(list1, list2, digits=3):
@@ -107,15 +134,22 @@ def compare_ranks(list1, list2):
     			 of spelling errors. CACM, 7(3), 1964.
     """
     j = jaccard_index(list1, list2)
-    
-    union = set(list1).union(set(list2))
-    alphanum_dict = generate_alphanum_dict(union)  
-    strings = map(lambda x : rank_as_string(x, alphanum_dict), [list1, list2])
-    dist = damerau_levenshtein_distance(unicode(strings[0]), unicode(strings[1]))
 
-    for i, string in enumerate(strings):
-        print(f"list{i}: {string}  len: {len(string)}")
-        
+    union = set(list1).union(set(list2))
+    code_of = {item: i for i, item in enumerate(union)}
+
+    if DamerauLevenshtein is not None:
+        # Integer codes go straight to the distance; no 62-item ceiling
+        seqs = [tuple(code_of[l] for l in lst) for lst in (list1, list2)]
+        return (j, DamerauLevenshtein.distance(seqs[0], seqs[1]))
+
+    # Fallback: encode as alphanumeric strings for jellyfish
+    alphanum_dict = generate_alphanum_dict(union)
+    chars_arr = np.frombuffer(
+        ''.join(alphanum_dict.values()).encode('ascii'), dtype=np.uint8)
+    strings = [_rank_as_bytes(l, code_of, chars_arr)
+               for l in (list1, list2)]
+    dist = damerau_levenshtein_distance(strings[0], strings[1])
     return (j, dist)
 
 
@@ -123,33 +157,67 @@ def compare_ranks(list1, list2):
 
 
 def get_bias_till(bias_scores, till_rank):
-    bias_till = {}
-    for idx, bias in enumerate(bias_scores[:till_rank]):
-        rank = idx + 1
-        bias_till[rank] = sum(bias_scores[:rank]) / rank
-    return bias_till
+    arr = np.asarray(bias_scores[:till_rank], dtype=np.float64)
+    bias_till = np.cumsum(arr) / np.arange(1, arr.shape[0] + 1)
+    return dict(enumerate(bias_till, start=1))
 
 
 def get_weighted_bias(bias_scores):
-    bias_till = get_bias_till(bias_scores, len(bias_scores))
-    total_bias = sum(bias_till.values())
-    weighted_bias = total_bias / len(bias_scores)
-    return weighted_bias
+    arr = np.asarray(bias_scores, dtype=np.float64)
+    return (np.cumsum(arr) / np.arange(1, arr.shape[0] + 1)).mean()
 
 
 def get_ranking_bias(bias_scores):
     return get_weighted_bias(bias_scores) - np.mean(bias_scores)
 
 
+def _bias_triplet_all(values, starts, ends):
+    """Get the three bias metrics for every group without a Python loop
+
+    Computes per-group running averages from one global cumsum (rebased
+    at each group start) and reduces each segment with np.add.reduceat,
+    so the work per group stays at C level.
+
+    Args:
+        values (np.ndarray): flat array of scores, grouped contiguously
+        starts (np.ndarray): start index of each group
+        ends (np.ndarray): end index (exclusive) of each group
+
+    Returns:
+        tuple: (average, weighted, ranking) bias arrays, one value per group
+    """
+    counts = ends - starts
+    group_start = np.repeat(starts, counts)
+    ranks = np.arange(values.shape[0]) - group_start + 1
+
+    cs = np.cumsum(values)
+    base = np.where(starts > 0, cs[starts - 1], 0.0)
+    running = (cs - np.repeat(base, counts)) / ranks
+
+    avg = np.add.reduceat(values, starts) / counts
+    weighted = np.add.reduceat(running, starts) / counts
+    return avg, weighted, weighted - avg
+
+
 def get_bias(results, group, bias_col):
-    bias = results.groupby(group)[bias_col].apply(list)
-    bias = bias.apply(lambda l: [i for i in l if not pd.isnull(i)])
-    bias = pd.DataFrame(bias).reset_index()
-    bias["n"] = bias[bias_col].apply(len)
-    bias = bias[bias["n"] != 0]
-    bias.drop("n", axis=1, inplace=True)
-    bias["average_bias"] = bias[bias_col].apply(np.mean)
-    bias["weighted_bias"] = bias[bias_col].apply(get_weighted_bias)
-    bias["ranking_bias"] = bias[bias_col].apply(get_ranking_bias)
-    bias.drop(columns=bias_col, inplace=True)  # Drop list col
-    return bias
+    # NaN group keys must go too: np.unique would hit them in the
+    # str-vs-float sort that groupby used to sidestep
+    df = results.dropna(subset=[group, bias_col])
+
+    # Stable sort keeps the rank order within each group; groups with no
+    # scores are dropped by the dropna above
+    df = df.sort_values(group, kind='stable')
+    values = df[bias_col].to_numpy(dtype=np.float64)
+    keys = df[group].to_numpy()
+    group_ids, starts = np.unique(keys, return_index=True)
+    ends = np.append(starts[1:], values.shape[0])
+
+    # All groups at once via segment reductions, no per-group Python work
+    avg, weighted, ranking = _bias_triplet_all(values, starts, ends)
+
+    return pd.DataFrame({
+        group: group_ids,
+        "average_bias": avg,
+        "weighted_bias": weighted,
+        "ranking_bias": ranking
+    })
@@ -33,9 +33,10 @@ def get_diff_days(start, end):
     Returns:
         pd.Series: The difference as a float
     """
-    tdelta = pd.to_datetime(end) - pd.to_datetime(start)
-    total_days = tdelta.dt.round(freq='d').dt.days
-    return total_days + tdelta.dt.seconds / 60 / 60 / 24
+    # cache=True reuses parsed values when date strings repeat; one
+    # total_seconds call replaces the round/days/seconds accessor chain
+    tdelta = pd.to_datetime(end, cache=True) - pd.to_datetime(start, cache=True)
+    return tdelta.dt.total_seconds() / 86400.0
 
 def get_time_range(col):
     start = col.min().strftime('%B %d, %Y')
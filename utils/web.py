@@ -14,25 +14,56 @@ import subprocess
 import tldextract
 import pandas as pd
 import numpy as np
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
+from functools import lru_cache
+from itertools import chain
 from urllib import parse
+from urllib3.util.retry import Retry
+
+try: # Resolve the lxml tree builder class once, not per soup
+    from bs4.builder import LXMLTreeBuilder as _LXML_BUILDER
+except ImportError:
+    _LXML_BUILDER = None
 
 # Load ------------------------------------------------------------------------
 
 def load_html(fp, zipped=False):
     """Load html file, with option for brotli decompression"""
-    read_func = lambda i: brotli.decompress(i.read()) if zipped else i.read()
-    read_type = 'rb' if zipped else 'r'
-    with open(fp, read_type) as infile:
-        return read_func(infile)
+    if not zipped:
+        with open(fp, 'r') as infile:
+            return infile.read()
+    # Stream 64KB chunks through the decompressor so the whole
+    # compressed file and its expansion are never resident together
+    decompressor = brotli.Decompressor()
+    chunks = []
+    with open(fp, 'rb') as infile:
+        while True:
+            buf = infile.read(1 << 16)
+            if not buf:
+                break
+            chunks.append(decompressor.process(buf))
+    return b''.join(chunks)
+
+def make_soup(html, parser='lxml', only=None):
+    """Create soup object, defaults to lxml parser
+
+    Args:
+        html (str/bytes): the HTML to parse
+        parser (str): bs4 parser; lxml is ~10x faster than html.parser
+        only (SoupStrainer, optional): parse only matching tags, e.g.
+            SoupStrainer('style') to skip building the rest of the tree
 
-def make_soup(html, parser='lxml'):
-    """Create soup object, defaults to lxml parser"""
-    return BeautifulSoup(html, parser)
+    Returns:
+        BeautifulSoup: the parsed document
+    """
+    if parser == 'lxml' and _LXML_BUILDER is not None:
+        # Skip the per-call feature-string registry lookup
+        return BeautifulSoup(html, builder=_LXML_BUILDER, parse_only=only)
+    return BeautifulSoup(html, parser, parse_only=only)
 
-def load_soup(fp, zipped=False):
+def load_soup(fp, zipped=False, only=None):
     """Load HTML file and convert to soup"""
-    return make_soup(load_html(fp, zipped))
+    return make_soup(load_html(fp, zipped), only=only)
 
 # URLs -------------------------------------------------------------------------
 
@@ -43,9 +74,11 @@ def join_url_quote(quote_dict):
         quote_dict (dict): key-value URL parameter pairs 
 
     Returns:
-        str: a "&" delimited string of key=value pairs
+        str: a "&" delimited string of key=value pairs, percent-encoded
     """
-    return '&'.join([f'{k}={v}' for k, v in quote_dict.items()])
+    # urlencode assembles the pairs in C and percent-encodes values,
+    # which the f-string join silently skipped
+    return parse.urlencode(quote_dict, doseq=True)
 
 
 def parse_url_query(query):
@@ -57,7 +90,9 @@ def parse_url_query(query):
     Returns:
         dict: a dictionary of URL query parameters, parameters with multiple values are concatenated with "|" under the same key.
     """
-    return {f'qs_{k}': '|'.join(q) for k, q in parse.parse_qs(query).items()}
+    # Most parameters are single-valued; skip the join on that path
+    return {'qs_' + k: q[0] if len(q) == 1 else '|'.join(q)
+            for k, q in parse.parse_qs(query).items()}
 
 
 def get_query_param(url, param):
@@ -74,8 +109,16 @@ def get_query_param(url, param):
     return qs[param] if param in qs else None
 
 
+@lru_cache(maxsize=100_000)
+def _parse_query_cached(query):
+    """Parse a query string once per distinct value, as a hashable tuple"""
+    return tuple(parse_url_query(query).items())
+
+
 def parse_url(url, parse_query=True):
     """Extract details from a URL with optional URL query parsing"""
+    # Log urls repeat heavily, so the query parse is memoized; the dict
+    # is rebuilt per call so callers can mutate their copy
     parsed = parse.urlparse(url)
     parsed = { # Convert object to dict
         'scheme': parsed.scheme,
@@ -86,9 +129,9 @@ def parse_url(url, parse_query=True):
         'fragment': parsed.fragment
     }
     # Extract queries
-    if parsed['query'] and parse_query: 
-        qs = parse_url_query(parsed['query'])
-        parsed['has_query'] = True if qs else False
+    if parsed['query'] and parse_query:
+        qs = _parse_query_cached(parsed['query'])
+        parsed['has_query'] = bool(qs)
         parsed.update(qs)
     return parsed
 
@@ -98,15 +141,36 @@ def url_unquote(url):
     return parse.unquote(url)
 
 
+# One extractor instance; tldextract.extract rebuilds its PSL trie
+# lookup state through a default singleton with live-fetch checks
+_EXTRACTOR = tldextract.TLDExtract(suffix_list_urls=None)
+
+
 def url_table(url):
-    """Break down a url into a table of its component parts"""
-    return pd.Series(tldextract.extract(url), index=['subdomain','domain','suffix'])
+    """Break down a url into its (subdomain, domain, suffix) parts
 
+    Returns the extractor's NamedTuple directly; building a pd.Series
+    per url made this pure overhead under DataFrame applies.
+    """
+    return _EXTRACTOR(url)
 
-def get_domain(url, fillna='', filter_www=True):
-    """Extract a full domain from a url, drop www"""
-    if pd.isnull(url): return fillna
-    extracted = tldextract.extract(url)
+
+def url_table_df(urls):
+    """Break down an array of urls into a table of their component parts
+
+    Args:
+        urls (pd.Series): an array of url strings
+
+    Returns:
+        pd.DataFrame: subdomain/domain/suffix columns, on the input index
+    """
+    extracted = [_EXTRACTOR(u) for u in urls.to_numpy()]
+    return pd.DataFrame(extracted, columns=['subdomain','domain','suffix'],
+                        index=urls.index)
+
+
+def _join_domain(extracted, filter_www=True):
+    """Join extracted url parts into a full domain, dropping www"""
     subdomain = extracted.subdomain
     if filter_www:
         if subdomain == 'www':
@@ -114,28 +178,53 @@ def get_domain(url, fillna='', filter_www=True):
         elif subdomain.startswith('www.'):
             # Handle multi subdomains (www.cruz.senate.gov')
             subdomain = subdomain[len("www."):]
-    subdomain = '' if filter_www and subdomain == 'www' else subdomain
-    domain = extracted.domain
-    suffix = extracted.suffix
+    return '.'.join(filter(None, (subdomain, extracted.domain,
+                                  extracted.suffix)))
+
+
+def get_domain(url, fillna='', filter_www=True):
+    """Extract a full domain from a url, drop www"""
+    if pd.isnull(url): return fillna
+    return _join_domain(_EXTRACTOR(url), filter_www)
+
+
+def get_domains(urls, fillna='', filter_www=True):
+    """Extract full domains for an array of urls
+
+    Factorizes first so the extractor runs once per distinct url, then
+    maps the results back with one take; log data repeats urls heavily.
+    Passing a `string[pyarrow]`-dtyped Series also works and keeps the
+    input in one contiguous buffer rather than a PyObject per row.
+
+    Args:
+        urls (pd.Series): an array of url strings
+
+    Returns:
+        pd.Series: full domains, on the input index
+    """
+    codes, uniques = pd.factorize(urls)
+    out = np.empty(len(uniques) + 1, dtype=object)
+    out[-1] = fillna # factorize codes missing values as -1
+    for i, u in enumerate(uniques):
+        out[i] = _join_domain(_EXTRACTOR(u), filter_www) \
+                 if isinstance(u, str) else fillna
+    return pd.Series(out[codes], index=urls.index)
 
-    components = [subdomain, domain, suffix]
-    domain_str = '.'.join(filter(None, components))
-    return domain_str
 
+_IPV4_RE = re.compile(
+    r'^(25[0-5]|2[0-4]\d|1\d\d|[1-9]?\d)'
+    r'(\.(25[0-5]|2[0-4]\d|1\d\d|[1-9]?\d)){3}$')
 
 def is_ipv4(s):
     """Check if a string is an IPv4 address"""
-    pieces = s.split('.')
-    if len(pieces) != 4: return False
-    try: return all(0<=int(p)<256 for p in pieces)
-    except ValueError: return False
+    return bool(_IPV4_RE.match(s))
 
 # Requests --------------------------------------------------------------------
 
 def start_sesh(headers=None, proxy_port=None):
     protocols = ['http', 'https']
     proxy_base = "socks5://127.0.0.1:"
-    
+
     # Generate a requests session object
     sesh = requests.Session()
 
@@ -146,8 +235,17 @@ def start_sesh(headers=None, proxy_port=None):
         proxies = {p: f'{proxy_base}{p}' for p in protocols}
         sesh.proxies.update(proxies)
 
-    for protocol in protocols: # Auto retry if random connection error
-        sesh.mount(protocol, requests.adapters.HTTPAdapter(max_retries=3))
+    # One shared adapter pools connections across both schemes and
+    # retries transient failures with exponential backoff instead of
+    # three blind immediate retries
+    retry = Retry(total=3, backoff_factor=0.2,
+                  status_forcelist=(429, 500, 502, 503, 504),
+                  allowed_methods=frozenset(['GET', 'HEAD']))
+    adapter = requests.adapters.HTTPAdapter(max_retries=retry,
+                                            pool_connections=32,
+                                            pool_maxsize=64)
+    for protocol in protocols:
+        sesh.mount(f'{protocol}://', adapter)
 
     return sesh
 
@@ -170,15 +268,16 @@ class SSH(object):
 
 def generate_ssh_tunnels(ips, ports, keyfile):
     """ Generate SSH tunnels for each (IP, port) combination"""
-
-    def generate_ssh_tunnel(ip, port, keyfile=keyfile):
+    os.chmod(keyfile, 0o600) # One syscall, not a chmod fork per tunnel
+    tunnels = []
+    for ip, port in zip(ips, ports):
         ssh_tunnel = SSH(ip=ip, port=port, keyfile=keyfile)
-        subprocess.call(['chmod', '600', keyfile])
-        print('{}'.format(ssh_tunnel.cmd_str))
+        print(ssh_tunnel.cmd_str)
+        # Popen returns immediately, so the handshakes overlap
         ssh_tunnel.open_tunnel()
         atexit.register(exit_handler, ssh_tunnel) # Always kill tunnels on exit
-
-    return [generate_ssh_tunnel(ip, port) for ip, port in zip(ips, ports)]
+        tunnels.append(ssh_tunnel)
+    return tunnels
 
 def exit_handler(ssh):
     print('Killing: {} on port: {}'.format(ssh.machine, ssh.port))
@@ -186,13 +285,26 @@ def exit_handler(ssh):
 
 # Parsing ----------------------------------------------------------------------
 
+_TAG_RE = re.compile(r'<[^<]+?>')
+
 def strip_html_tags(string):
     """Strips HTML <tags>"""
-    return re.sub('<[^<]+?>', '', string)
+    return _TAG_RE.sub('', string)
 
 def has_captcha(soup):
-    """Detect CAPTCHA appearance in soup"""
-    return True if soup.find(text=re.compile('CAPTCHA')) else False
+    """Detect CAPTCHA appearance in soup or raw HTML
+
+    Soup input scans the rendered text, matching the old text-node
+    walk; raw str/bytes HTML is scanned as-is, which is approximate
+    since tags and attribute values enter the search space.
+    """
+    # The needle is a fixed literal, so one C-level substring scan
+    # beats walking every NavigableString with a regex
+    if isinstance(soup, bytes):
+        return b'CAPTCHA' in soup
+    if isinstance(soup, str):
+        return 'CAPTCHA' in soup
+    return 'CAPTCHA' in soup.get_text()
 
 def get_html_language(soup):
     """Extract langauge from HTML tags"""
@@ -202,46 +314,58 @@ def get_html_language(soup):
         language = ''
     return language
 
+_HASHTAG_RE = re.compile(r'#\w+', re.UNICODE)
+
 def parse_hashtags(text):
     """Extract unique hashtags and strip surrounding punctuation"""
-    hashtags = set([w for w in text.split() if w.startswith("#")])
-    hashtags = [re.sub(r"(\W+)$", "", h, flags = re.UNICODE) for h in hashtags]
-    return list(set(hashtags))
+    # One findall pass captures the trimmed tag directly; dict.fromkeys
+    # dedups with a single hash-table build and keeps first-seen order
+    return list(dict.fromkeys(_HASHTAG_RE.findall(text)))
+
+# Private-use sentinels mark demojized names unambiguously; CLDR names
+# mix case and punctuation, and literal :word: text must not match
+_EMOJI_DELIMS = ('\ue000', '\ue001')
+_DEMOJIZED_RE = re.compile('\ue000([^\ue001]+)\ue001')
 
 def parse_emojis(text):
     """Extract all emojis in a string"""
-    return [emoji.demojize(e['emoji']) for e in emoji.emoji_lis(text)]
+    # Demojize the whole string in one pass over emoji's trie, then
+    # pull the delimited names, instead of a demojize call per hit
+    demojized = emoji.demojize(text, delimiters=_EMOJI_DELIMS)
+    return [f':{name}:' for name in _DEMOJIZED_RE.findall(demojized)]
 
 def extract_css(soup):
     """Extract embedded CSS """
-    
-    def split_style(style):
-        if style.string:
-            return style.string.replace('}', '}\n').split('\n')
-        else:
-            return None
-
-    styles = soup.find_all('style')
-    if styles:
-        return sum(list(map(split_style, styles)), [])
-    else:
-        return None
+    # Flatten with chain; sum() re-concatenates lists quadratically
+    parts = (s.string.replace('}', '}\n').splitlines()
+             for s in soup.find_all('style') if s.string)
+    return list(chain.from_iterable(parts)) or None
 
 def extract_html_json(data_fp, extract_to, id_col):
     """Save HTML to directory for viewing """
     os.makedirs(extract_to, exist_ok=True)
     data = pd.read_json(data_fp, lines=True)
-    for idx, row in data.iterrows():
-        fp = os.path.join(extract_to, row[id_col] + '.html') 
+    # Iterate plain arrays; iterrows builds a Series per row
+    ids = data[id_col].to_numpy()
+    htmls = data['html'].to_numpy()
+    for i in range(len(ids)):
+        fp = os.path.join(extract_to, ids[i] + '.html')
         with open(fp, 'wb') as outfile:
-            outfile.write(row['html'])
+            outfile.write(htmls[i])
 
 # Sessions ---------------------------------------------------------------------
 
-def get_sequential_duplicates(series): 
+def get_sequential_duplicates(series):
     """Returns a boolean indicating if previous entry has same value"""
-    boolean = series.shift() == series
-    return boolean if type(series) == pd.Series else boolean.all(axis=1)
+    # Slice-compare the raw array; shift() allocates a NaN-filled copy
+    # and a second boolean Series
+    arr = series.to_numpy()
+    out = np.empty(len(arr), dtype=bool)
+    if len(arr):
+        out[0] = False
+        out[1:] = arr[1:] == arr[:-1] if arr.ndim == 1 \
+                  else (arr[1:] == arr[:-1]).all(axis=1)
+    return pd.Series(out, index=series.index)
 
 def get_interrow_interval(series):
     """Returns the time difference between datetime entries in seconds"""
@@ -262,38 +386,33 @@ def get_sessions(user, tvar='unixtime', dupe_col='', session_delimiter=30*60):
         pd.DataFrame -- Dataframe with added session columns
     """
     
-    # Sort by visit time, calculate time diff
+    # Sort by visit time, then derive everything from the raw array and
+    # attach it with one assign instead of a column insertion per step
     user = user.sort_values(tvar).reset_index(drop=True)
-    user['time_diff'] = get_interrow_interval(user[tvar])
+    t = user[tvar].to_numpy()
+    diff = np.empty(len(t))
+    if len(t):
+        diff[0] = np.nan
+        if np.issubdtype(t.dtype, np.datetime64):
+            diff[1:] = (t[1:] - t[:-1]) / np.timedelta64(1, 's')
+        else: # Numeric stamps (e.g. unixtime) are already seconds
+            diff[1:] = t[1:] - t[:-1]
+
+    cols = {'time_diff': diff}
 
     # Add sequential duplicates
     if dupe_col:
-        user['seq_dupe'] = get_sequential_duplicates(user[dupe_col])
-    
-    # Reset index to get ordered int, cut on index if time from last action 
-    # greater than set delimiter
-    user = user.reset_index()
-    user['bool_sesh'] = user.time_diff > session_delimiter
-    # print(f'Number of search sessions: {user["bool_sesh"].sum()}')
-
-    # Set cut points, include max and min manually as np.inf
-    session_cut_points = [idx for idx, b in user['bool_sesh'].items() if b]
-    session_cut_points = [-np.inf] + session_cut_points + [np.inf]
-    
-    # Make the cuts
-    user['session'] = pd.cut(user['index'], bins=session_cut_points,
-                             right=False, labels=False)
+        cols['seq_dupe'] = get_sequential_duplicates(user[dupe_col])
 
-    # Mark session index (i.e. subunits)
-    user['session_idx'] = user.groupby(
-        (user['session'] != user['session'].shift(1)).cumsum()
-    ).cumcount() + 1
+    # A session id is just the running count of delimiter crossings;
+    # the subunit index is an arange rebased at each session start
+    delims = diff > session_delimiter
+    pos = np.arange(len(t))
+    starts = np.where(delims, pos, 0)
+    cols['session'] = delims.cumsum()
+    cols['session_idx'] = pos - np.maximum.accumulate(starts) + 1
 
     # Add latency (time_diff - from session data) as time elapsed on the page
-    user['time_elapsed'] = user['time_diff'].shift(-1)
-
-    # Remove process variables
-    del user['index']
-    del user['bool_sesh']
+    cols['time_elapsed'] = np.append(diff[1:], np.nan)
 
-    return user
+    return user.assign(**cols)